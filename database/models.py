@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String,Date,Table, Boolean
+from sqlalchemy import Column, Integer, String,Date,Table, Boolean, Index, extract
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql.schema import ForeignKey
 from sqlalchemy.sql.sqltypes import DateTime
@@ -8,7 +8,7 @@ class UserAuth(Base):
     __tablename__ = 'users_auth'
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(50))
-    email = Column(String, nullable=False,index=True)
+    email = Column(String, nullable=False,unique=True,index=True)
     password = Column(String(255), nullable=False)
     avatar = Column(String(255), nullable=True)
     refresh_token = Column(String(255), nullable=True)
@@ -17,11 +17,15 @@ class UserAuth(Base):
 class User(Base):
     __tablename__ = 'users'
     id = Column(Integer, primary_key=True, index=True)
-    first_name = Column(String(25),nullable=False)
-    last_name = Column(String(25),nullable=False)
+    first_name = Column(String(25),nullable=False,index=True)
+    last_name = Column(String(25),nullable=False,index=True)
     birthday_date = Column(Date)
     email = Column(String, nullable=False,index=True)
     phone_numbers = Column(String,nullable=False,index=True)
     other_description = Column(String, nullable=True, default=None)
 
+    __table_args__ = (
+        Index('users_birthday_md_idx', extract('month', birthday_date), extract('day', birthday_date)),
+    )
+
 # Base.metadata.create_all(bind=engine)
\ No newline at end of file
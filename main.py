@@ -1,9 +1,57 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi_limiter import FastAPILimiter
 from routes import users,auth
 from fastapi.middleware.cors import CORSMiddleware
 import redis.asyncio
-app = FastAPI()
+import cloudinary
+from conf.config import settings
+from services.auth import Auth
+from database.connect_db import engine
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Initialize necessary components and services for the lifetime of the application.
+
+    On startup it performs the following tasks:
+    1. Creates a single Redis connection pool for the process and stores it on ``app.state``;
+       when all 50 connections are in use, callers wait up to 5 seconds for one to be released.
+    2. Initializes the FastAPILimiter using a client on that pool for rate limiting;
+       loading the limiter script also opens the first Redis connection.
+    3. Binds the authentication cache to a client on the same pool.
+    4. Configures the Cloudinary client used for avatar uploads.
+    5. Opens and returns a few database connections so the pool is warm before the first request.
+
+    On shutdown it closes the Redis pool and disposes of the database engine.
+
+    :param app: The FastAPI application.
+    :type app: FastAPI
+    """
+    app.state.redis_pool = redis.asyncio.BlockingConnectionPool.from_url(
+        f"redis://{settings.redis_host}:{settings.redis_port}/0", max_connections=50, timeout=5,
+        decode_responses=False
+    )
+    r = redis.asyncio.Redis(connection_pool=app.state.redis_pool)
+    await FastAPILimiter.init(r)
+    Auth.r = r
+    cloudinary.config(
+        cloud_name=settings.cloudinary_name,
+        api_key=settings.cloudinary_api_key,
+        api_secret=settings.cloudinary_api_secret,
+        secure=True
+    )
+    connections = [await engine.connect() for _ in range(5)]
+    for connection in connections:
+        await connection.close()
+    yield
+    await app.state.redis_pool.disconnect()
+    await engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 origins = [ 
     "http://localhost:3000"
     ]
@@ -18,22 +66,6 @@ app.include_router(auth.router, prefix='/api')
 app.include_router(users.router, prefix='/api')
 
 
-@app.on_event("startup")
-async def startup():
-    """
-    Initialize necessary components and services during application startup.
-
-    This function is called when the FastAPI application starts up.
-    It performs the following tasks:
-    1. Establishes a connection to a Redis server.
-    2. Initializes the FastAPILimiter using the Redis connection for rate limiting.
-
-    :return: None
-    """
-    r = await redis.asyncio.Redis(host='localhost', port=6379, db=0, encoding="utf-8",
-                          decode_responses=True)
-    await FastAPILimiter.init(r)
-
 @app.get("/")
 def read_root():
     """
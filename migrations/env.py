@@ -1,6 +1,7 @@
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
+from sqlalchemy import make_url
 from sqlalchemy import pool
 
 from alembic import context
@@ -20,7 +21,11 @@ if config.config_file_name is not None:
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
-config.set_main_option("sqlalchemy.url", SQLALCHEMY_DATABASE_URL)
+# the application connects through asyncpg; migrations run on the sync psycopg2 driver
+config.set_main_option(
+    "sqlalchemy.url",
+    make_url(SQLALCHEMY_DATABASE_URL).set(drivername="postgresql+psycopg2").render_as_string(hide_password=False),
+)
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -0,0 +1,31 @@
+"""birthday month day index
+
+Revision ID: 5c0e7a3d91b2
+Revises: 37f6fb105986
+Create Date: 2026-10-15 10:12:40.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c0e7a3d91b2'
+down_revision: Union[str, None] = '37f6fb105986'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'users_birthday_md_idx',
+        'users',
+        [sa.extract('month', sa.column('birthday_date')), sa.extract('day', sa.column('birthday_date'))],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('users_birthday_md_idx', table_name='users')
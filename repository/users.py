@@ -1,35 +1,64 @@
+import calendar
 from typing import List,Optional
 from libgravatar import Gravatar
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, extract, or_, select, tuple_, update
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date,timedelta
 from database.models import User,UserAuth
 from schemas import UserSchema, UserModel
 
-async def get_user_by_email(email: str, db: Session) -> User:
+_USER_RESPONSE_COLUMNS = (User.id, User.first_name, User.last_name, User.birthday_date, User.phone_numbers, User.email,
+                          User.other_description)
+
+
+def _birthday_window(today: date, days: int) -> List[tuple[int, int]]:
+    """
+    Builds the (month, day) pairs covered by the window of days starting from today.
+
+    In non-leap years Feb 29 birthdays are reported together with Feb 28.
+
+    :param today: The start date.
+    :type today: date
+    :param days: The number of days after the start date to include.
+    :type days: int
+    :return: The (month, day) pairs in the window.
+    :rtype: List[tuple[int, int]]
+    """
+    month_days = []
+    for d in (today + timedelta(days=i) for i in range(days + 1)):
+        month_days.append((d.month, d.day))
+        if d.month == 2 and d.day == 28 and not calendar.isleap(d.year):
+            month_days.append((2, 29))
+    return month_days
+
+async def get_user_by_email(email: str, db: AsyncSession) -> User:
     """
     This function takes an email and a db session and returns a user object from the database if it exists with that email address.
 
     :param email: User email
     :type email: str
     :param db: The database session
-    :type db: Session
+    :type db: AsyncSession
     :return: A user object from the database if one exists with this email address.
     :rtype: User|None
     """
-    return db.query(UserAuth).filter(UserAuth.email == email).first()
+    result = await db.execute(select(UserAuth).where(UserAuth.email == email))
+    return result.scalar_one_or_none()
 
 
-async def create_user(body: UserModel, db: Session) -> User:
+async def create_user(body: UserModel, db: AsyncSession) -> User:
     """
     Creates a new user in the database
 
     :param body: A parameter that has already been validated by the user model UserModel from the request body.
     :type body: UserModel
     :param db: The database session
-    :type db: Session
+    :type db: AsyncSession
     :return: The newly created User object
     :rtype: User
     """
+    # Gravatar builds the URL from an md5 of the email locally; no request is made.
     avatar = None
     try:
         g = Gravatar(body.email)
@@ -38,11 +67,11 @@ async def create_user(body: UserModel, db: Session) -> User:
         print(e)
     new_user = UserAuth(**body.dict(),avatar=avatar)
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     return new_user
 
-async def update_avatar(email, url: str, db: Session) -> User:
+async def update_avatar(email, url: str, db: AsyncSession) -> User:
     """
     Updates the user's avatar in the database.
 
@@ -51,17 +80,17 @@ async def update_avatar(email, url: str, db: Session) -> User:
     :param url: URL of the image
     :type url: str
     :param db: The database session
-    :type db: Session
+    :type db: AsyncSession
     :return: the user, with an updated avatar
     :rtype: User
     """
-    user = await get_user_by_email(email, db)
-    user.avatar = url
-    db.commit()
+    result = await db.execute(update(UserAuth).where(UserAuth.email == email).values(avatar=url).returning(UserAuth))
+    user = result.scalar_one()
+    await db.commit()
     return user
 
 
-async def update_token(user: UserAuth, token: str | None, db: Session) -> None:
+async def update_token(user: UserAuth, token: str | None, db: AsyncSession) -> None:
     """
     Updates the user's refresh_token field and commits the changes to the database.
     
@@ -70,15 +99,15 @@ async def update_token(user: UserAuth, token: str | None, db: Session) -> None:
     :param token: Refresh token
     :type token: str|None
     :param db: The database session
-    :type db: Session
+    :type db: AsyncSession
     :return: None
     :rtype: None
 
     """
     user.refresh_token = token
-    db.commit()
+    await db.commit()
 
-async def get_users(skip: int, limit: int,user: UserAuth, db: Session) -> List[User]:
+async def get_users(skip: int, limit: int,user: UserAuth, db: AsyncSession) -> List[RowMapping]:
     """
     Retrieves a list of users for a specific user with specified pagination parameters.
 
@@ -89,14 +118,15 @@ async def get_users(skip: int, limit: int,user: UserAuth, db: Session) -> List[U
     :param user: The user to retrieve users for.
     :type user: UserAuth
     :param db: The database session.
-    :type db: Session
-    :return: A list of users.
-    :rtype: List[User]
+    :type db: AsyncSession
+    :return: A list of users as column mappings.
+    :rtype: List[RowMapping]
     """
-    return db.query(User).offset(skip).limit(limit).all()
+    result = await db.execute(select(*_USER_RESPONSE_COLUMNS).offset(skip).limit(limit))
+    return result.mappings().all()
 
 
-async def get_user(user_id: int,user: UserAuth, db: Session) -> User:
+async def get_user(user_id: int,user: UserAuth, db: AsyncSession) -> User:
     """
     Retrieves a single user with the specified ID for a specific user.
 
@@ -105,35 +135,40 @@ async def get_user(user_id: int,user: UserAuth, db: Session) -> User:
     :param user: The user to retrieve the user for.
     :type user: UserAuth
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
     :return: The user with the specified ID, or None if it does not exist.
     :rtype: User | None
     """
-    return db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    return result.scalar_one_or_none()
 
-async def get_birthday(today, end_date,user: UserAuth,db: Session):
+async def get_birthday(today: date, days: int,user: UserAuth,db: AsyncSession, skip: int = 0, limit: int = 100):
     """
-    Retrieves the start date and end date.
+    Retrieves users whose birthday falls within the given number of days starting from today.
 
     :param today: The start date.
     :type today: date
-    :param end_date: The end date.
-    :type end_date: date
+    :param days: The number of days after the start date to include.
+    :type days: int
     :param user: The user to retrieve the user for.
     :type user: UserAuth
     :param db: The database session.
-    :type db: Session
-    :return: A list of users, or None if if there are none.
-    :rtype: List[User] | None
+    :type db: AsyncSession
+    :param skip: The number of users to skip.
+    :type skip: int
+    :param limit: The maximum number of users to return.
+    :type limit: int
+    :return: A list of users as column mappings, or None if if there are none.
+    :rtype: List[RowMapping] | None
     """
-    users =  db.query(User).all()
-    result = []
-    for user in users:
-        if (user.birthday_date.month >= today.month and user.birthday_date.day >= today.day and user.birthday_date.month <= end_date.month and user.birthday_date.day <= end_date.day):
-            result.append(user)
-    return result
+    month_days = _birthday_window(today, days)
+    result = await db.execute(select(*_USER_RESPONSE_COLUMNS).where(
+        tuple_(extract('month', User.birthday_date), extract('day', User.birthday_date)).in_(month_days)
+    ).order_by(User.id).offset(skip).limit(limit))
+    return result.mappings().all()
 
-async def search_users(first_name:str|None, last_name: str|None,email:str|None,user: UserAuth, db: Session):
+async def search_users(first_name:str|None, last_name: str|None,email:str|None,user: UserAuth, db: AsyncSession,
+                       skip: int = 0, limit: int = 100):
     """
     Retrieves the user's first or last name or email, to search for the user by these parameters.
 
@@ -146,25 +181,29 @@ async def search_users(first_name:str|None, last_name: str|None,email:str|None,u
     :param user: The user to retrieve the user for.
     :type user: UserAuth
     :param db: The database session.
-    :type db: Session
-    :return: A list of users, or None if if there are none.
-    :rtype: List[User] | None
-    """
-    result = []
-    users =  db.query(User).all()
-    for user in users:
-        if first_name != None:
-            if  user.first_name == first_name:
-                result.append(user)
-        if last_name != None:
-            if user.last_name == last_name:
-                result.append(user)
-        if email != None:
-            if user.email == email:
-                result.append(user)
-    return result
-
-async def create_users(body: UserSchema,user: UserAuth, db: Session) -> User:
+    :type db: AsyncSession
+    :param skip: The number of users to skip.
+    :type skip: int
+    :param limit: The maximum number of users to return.
+    :type limit: int
+    :return: A list of users as column mappings, or None if if there are none.
+    :rtype: List[RowMapping] | None
+    """
+    conditions = []
+    if first_name is not None:
+        conditions.append(User.first_name == first_name)
+    if last_name is not None:
+        conditions.append(User.last_name == last_name)
+    if email is not None:
+        conditions.append(User.email == email)
+    if not conditions:
+        return []
+    result = await db.execute(
+        select(*_USER_RESPONSE_COLUMNS).where(or_(*conditions)).order_by(User.id).offset(skip).limit(limit)
+    )
+    return result.mappings().all()
+
+async def create_users(body: UserSchema,user: UserAuth, db: AsyncSession) -> User:
     """
     Creates a new user for a specific user.
 
@@ -173,18 +212,18 @@ async def create_users(body: UserSchema,user: UserAuth, db: Session) -> User:
     :param user: The user to retrieve the user for.
     :type user: UserAuth
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
     :return: The newly created user.
     :rtype: User
     """
     user_ = User(first_name=body.first_name,last_name=body.last_name,birthday_date = body.birthday_date,email=body.email,phone_numbers=body.phone_numbers,other_description = body.other_description)
     db.add(user_)
-    db.commit()
-    db.refresh(user_)
+    await db.commit()
+    await db.refresh(user_)
     return user_
 
 
-async def update_user(user_id: int, body: UserSchema,user: UserAuth, db: Session) -> User | None:
+async def update_user(user_id: int, body: UserSchema,user: UserAuth, db: AsyncSession) -> User | None:
     """
     Updates a single user with the specified ID for a specific user.
 
@@ -195,21 +234,16 @@ async def update_user(user_id: int, body: UserSchema,user: UserAuth, db: Session
     :param user: The user to update the user for.
     :type user: UserAuth
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
     :return: The updated user, or None if it does not exist.
     :rtype: User | None
     """
-    user = db.query(User).filter(User.id == user_id).first()
-    if user:
-        user.first_name = body.first_name
-        user.last_name = body.last_name
-        user.phone_numbers = body.phone_numbers
-        user.email = body.email
-        user.other_description = body.other_description
-        db.commit()
+    result = await db.execute(update(User).where(User.id == user_id).values(**body.dict()).returning(User))
+    user = result.scalar_one_or_none()
+    await db.commit()
     return user
 
-async def remove_user(user_id: int,user: UserAuth, db: Session) -> User | None:
+async def remove_user(user_id: int,user: UserAuth, db: AsyncSession) -> User | None:
     """
     Removes a single user with the specified ID for a specific user.
 
@@ -218,27 +252,25 @@ async def remove_user(user_id: int,user: UserAuth, db: Session) -> User | None:
     :param user: The user to remove the user for.
     :type user: UserAuth
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
     :return: The removed user, or None if it does not exist.
     :rtype: User | None
     """
-    user = db.query(User).filter(User.id == user_id).first()
-    if user:
-        db.delete(user)
-        db.commit()
+    result = await db.execute(delete(User).where(User.id == user_id).returning(User))
+    user = result.scalar_one_or_none()
+    await db.commit()
     return user
 
-async def confirmed_email(email: str, db: Session) -> None:
+async def confirmed_email(email: str, db: AsyncSession) -> None:
     """
     Sets the user's confirmed attribute to True in the database.
 
     :param email: User email
     :type email: str
     :param db: The database session.
-    :type db: Session
+    :type db: AsyncSession
     :return: None
     :rtype: None
     """
-    user = await get_user_by_email(email, db)
-    user.confirmed = True
-    db.commit()
+    await db.execute(update(UserAuth).where(UserAuth.email == email).values(confirmed=True))
+    await db.commit()
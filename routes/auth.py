@@ -2,7 +2,7 @@ from typing import List
 
 from fastapi import APIRouter, HTTPException, Depends, status, Security, Request, BackgroundTasks
 from fastapi.security import OAuth2PasswordRequestForm, HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.connect_db import get_db
 from schemas import UserModel, UserResponses, TokenModel,RequestEmail
@@ -15,7 +15,7 @@ security = HTTPBearer()
 
 
 @router.post("/signup", response_model=UserResponses, status_code=status.HTTP_201_CREATED)
-async def signup(body: UserModel,background_tasks: BackgroundTasks,request: Request, db: Session = Depends(get_db)):
+async def signup(body: UserModel,background_tasks: BackgroundTasks,request: Request, db: AsyncSession = Depends(get_db)):
     """
     New user registration.
 
@@ -26,28 +26,30 @@ async def signup(body: UserModel,background_tasks: BackgroundTasks,request: Requ
     :param request: The request object.
     :type request: Request
     :param db: The database session object.
-    :type db: Session
+    :type db: AsyncSession
     :return: Information about the created user and the registration result.
     :rtype: dict
     """
     exist_user = await repository_users.get_user_by_email(body.email, db)
     if exist_user:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Account already exists")
-    body.password = auth_service.get_password_hash(body.password)
+    # end the read transaction so the pooled connection is not held while bcrypt runs
+    await db.rollback()
+    body.password = await auth_service.get_password_hash(body.password)
     new_user = await repository_users.create_user(body, db)
     background_tasks.add_task(send_email, new_user.email, new_user.username, request.base_url)
     return {"user": new_user, "detail": "User successfully created"}
 
 
 @router.post("/login", response_model=TokenModel)
-async def login(body: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(body: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     """
     User login.
 
     :param body: User login data.
     :type body: OAuth2PasswordRequestForm
     :param db: The database session object.
-    :type db: Session
+    :type db: AsyncSession
     :return: Access tokens and updates for the user.
     :rtype: dict
     """
@@ -56,7 +58,7 @@ async def login(body: OAuth2PasswordRequestForm = Depends(), db: Session = Depen
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email")
     if not user.confirmed:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Email not confirmed")
-    if not auth_service.verify_password(body.password, user.password):
+    if not await auth_service.verify_password(body.password, user.password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid password")
 
     access_token = await auth_service.create_access_token(data={"sub": user.email})
@@ -65,14 +67,14 @@ async def login(body: OAuth2PasswordRequestForm = Depends(), db: Session = Depen
     return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
 @router.get('/confirmed_email/{token}')
-async def confirmed_email(token: str, db: Session = Depends(get_db)):
+async def confirmed_email(token: str, db: AsyncSession = Depends(get_db)):
     """
     User email confirmation.
 
     :param token: Token for email verification.
     :type token: str
     :param db: The database session object.
-    :type db: Session
+    :type db: AsyncSession
     :return: Email verification result.
     :rtype: dict
     """
@@ -83,11 +85,12 @@ async def confirmed_email(token: str, db: Session = Depends(get_db)):
     if user.confirmed:
         return {"message": "Your email is already confirmed"}
     await repository_users.confirmed_email(email, db)
+    await auth_service.clear_user_cache(email)
     return {"message": "Email confirmed"}
 
 @router.post('/request_email')
 async def request_email(body: RequestEmail, background_tasks: BackgroundTasks, request: Request,
-                        db: Session = Depends(get_db)):
+                        db: AsyncSession = Depends(get_db)):
     """
     User email confirmation request.
 
@@ -98,7 +101,7 @@ async def request_email(body: RequestEmail, background_tasks: BackgroundTasks, r
     :param request: The request object.
     :type request: Request
     :param db: The database session object.
-    :type db: Session
+    :type db: AsyncSession
     :return: The result of the confirmation request.
     :rtype: dict
     """
@@ -111,14 +114,14 @@ async def request_email(body: RequestEmail, background_tasks: BackgroundTasks, r
     return {"message": "Check your email for confirmation."}
 
 @router.get('/refresh_token', response_model=TokenModel)
-async def refresh_token(credentials: HTTPAuthorizationCredentials = Security(security), db: Session = Depends(get_db)):
+async def refresh_token(credentials: HTTPAuthorizationCredentials = Security(security), db: AsyncSession = Depends(get_db)):
     """
     Updating a user's access token.
 
     :param credentials: User authorization data.
     :type credentials: HTTPAuthorizationCredentials
     :param db: The database session object.
-    :type db: Session
+    :type db: AsyncSession
     :return: Updated access tokens and updates for the user.
     :rtype: dict
     """
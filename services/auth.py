@@ -1,17 +1,32 @@
 from typing import Optional
-import pickle
-from jose import JWTError, jwt
+import asyncio
+import orjson
+from cachetools import TTLCache
+from jose import JWTError, jwk, jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
-from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+import time
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.connect_db import get_db
+from database.models import UserAuth
 from repository import users as repository_users
-import redis
+import redis.asyncio
 from conf.config import settings
 
+_USER_CACHE_FIELDS = ("id", "email", "username", "confirmed", "avatar")
+
+_CREDENTIALS_KWARGS = {
+    "status_code": status.HTTP_401_UNAUTHORIZED,
+    "detail": "Could not validate credentials",
+    "headers": {"WWW-Authenticate": "Bearer"},
+}
+_EMAIL_TOKEN_KWARGS = {
+    "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
+    "detail": "Invalid token for email verification",
+}
+
 class Auth:
     """
     Authentication utility class.
@@ -19,19 +34,23 @@ class Auth:
     :cvar pwd_context: Password context for hashing and verifying passwords.
     :cvar SECRET_KEY: Secret key used for encoding and decoding tokens.
     :cvar ALGORITHM: Algorithm used for token encoding.
+    :cvar SIGNING_KEY: Key object built once from SECRET_KEY and reused for every encode and decode.
     :cvar oauth2_scheme: OAuth2 password bearer scheme.
-    :cvar r: Redis client for caching user data.
+    :cvar r: Async Redis client for caching user data, bound to the shared connection pool on application startup.
+    :cvar user_cache: In-process cache of user data, checked before Redis.
     :rtype: None
     """
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
     SECRET_KEY = settings.secret_key
     ALGORITHM = settings.algorithm
+    SIGNING_KEY = jwk.construct(SECRET_KEY, ALGORITHM)
     oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
-    r = redis.Redis(host=settings.redis_host, port=settings.redis_port, db=0)
+    r: redis.asyncio.Redis | None = None
+    user_cache = TTLCache(maxsize=10_000, ttl=30)
 
-    def verify_password(self, plain_password, hashed_password):
+    async def verify_password(self, plain_password, hashed_password):
         """
-        Verify a plain password against a hashed password.
+        Verify a plain password against a hashed password in a worker thread.
 
         :param plain_password: The plain text password to verify.
         :type plain_password: str
@@ -40,18 +59,18 @@ class Auth:
         :return: True if the passwords match, False otherwise.
         :rtype: bool
         """
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return await asyncio.to_thread(self.pwd_context.verify, plain_password, hashed_password)
 
-    def get_password_hash(self, password: str):
+    async def get_password_hash(self, password: str):
         """
-        Hash a password.
+        Hash a password in a worker thread.
 
         :param password: The password to hash.
         :type password: str
         :return: The hashed password.
         :rtype: str
         """
-        return self.pwd_context.hash(password)
+        return await asyncio.to_thread(self.pwd_context.hash, password)
     
     def create_email_token(self, data: dict):
         """
@@ -63,9 +82,9 @@ class Auth:
         :rtype: str
         """
         to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(days=7)
-        to_encode.update({"iat": datetime.utcnow(), "exp": expire})
-        token = jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
+        now = int(time.time())
+        to_encode.update({"iat": now, "exp": now + 7 * 24 * 60 * 60})
+        token = jwt.encode(to_encode, self.SIGNING_KEY, algorithm=self.ALGORITHM)
         return token
     
     async def get_email_from_token(self, token: str):
@@ -78,13 +97,12 @@ class Auth:
         :rtype: str
         """
         try:
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            payload = jwt.decode(token, self.SIGNING_KEY, algorithms=[self.ALGORITHM])
             email = payload["sub"]
             return email
         except JWTError as e:
             print(e)
-            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                          detail="Invalid token for email verification")
+            raise HTTPException(**_EMAIL_TOKEN_KWARGS)
 
     async def create_access_token(self, data: dict, expires_delta: Optional[float] = None):
         """
@@ -98,12 +116,13 @@ class Auth:
         :rtype: str
         """
         to_encode = data.copy()
+        now = int(time.time())
         if expires_delta:
-            expire = datetime.utcnow() + timedelta(seconds=expires_delta)
+            expire = now + int(expires_delta)
         else:
-            expire = datetime.utcnow() + timedelta(minutes=15)
-        to_encode.update({"iat": datetime.utcnow(), "exp": expire, "scope": "access_token"})
-        encoded_access_token = jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
+            expire = now + 15 * 60
+        to_encode.update({"iat": now, "exp": expire, "scope": "access_token"})
+        encoded_access_token = jwt.encode(to_encode, self.SIGNING_KEY, algorithm=self.ALGORITHM)
         return encoded_access_token
 
 
@@ -119,12 +138,13 @@ class Auth:
         :rtype: str
         """
         to_encode = data.copy()
+        now = int(time.time())
         if expires_delta:
-            expire = datetime.utcnow() + timedelta(seconds=expires_delta)
+            expire = now + int(expires_delta)
         else:
-            expire = datetime.utcnow() + timedelta(days=7)
-        to_encode.update({"iat": datetime.utcnow(), "exp": expire, "scope": "refresh_token"})
-        encoded_refresh_token = jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
+            expire = now + 7 * 24 * 60 * 60
+        to_encode.update({"iat": now, "exp": expire, "scope": "refresh_token"})
+        encoded_refresh_token = jwt.encode(to_encode, self.SIGNING_KEY, algorithm=self.ALGORITHM)
         return encoded_refresh_token
 
     async def decode_refresh_token(self, refresh_token: str):
@@ -137,7 +157,7 @@ class Auth:
         :rtype: str
         """
         try:
-            payload = jwt.decode(refresh_token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            payload = jwt.decode(refresh_token, self.SIGNING_KEY, algorithms=[self.ALGORITHM])
             if payload['scope'] == 'refresh_token':
                 email = payload['sub']
                 return email
@@ -145,43 +165,52 @@ class Auth:
         except JWTError:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Could not validate credentials')
 
-    async def get_current_user(self, token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    async def get_current_user(self, token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
         """
         Get the current user based on an access token.
 
         :param token: The access token.
         :type token: str
         :param db: The database session.
-        :type db: Session
+        :type db: AsyncSession
         :return: The current user.
         :rtype: User
         """
-        credentials_exception = HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
         try:
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            payload = jwt.decode(token, self.SIGNING_KEY, algorithms=[self.ALGORITHM])
             if payload['scope'] == 'access_token':
                 email = payload["sub"]
                 if email is None:
-                    raise credentials_exception
+                    raise HTTPException(**_CREDENTIALS_KWARGS)
             else:
-                raise credentials_exception
+                raise HTTPException(**_CREDENTIALS_KWARGS)
         except JWTError as e:
-            raise credentials_exception
-        user = self.r.get(f"user:{email}")
-        if user is None:
-            user = await repository_users.get_user_by_email(email, db)
-            if user is None:
-                raise credentials_exception
-            self.r.set(f"user:{email}", pickle.dumps(user))
-            self.r.expire(f"user:{email}", 900)
-        else:
-            user = pickle.loads(user)
-        return user
+            raise HTTPException(**_CREDENTIALS_KWARGS)
+        data = self.user_cache.get(email)
+        if data is None:
+            cached = await self.r.get(f"user:{email}")
+            if cached is None:
+                user = await repository_users.get_user_by_email(email, db)
+                if user is None:
+                    raise HTTPException(**_CREDENTIALS_KWARGS)
+                data = {f: getattr(user, f) for f in _USER_CACHE_FIELDS}
+                await self.r.set(f"user:{email}", orjson.dumps(data), ex=900)
+            else:
+                data = orjson.loads(cached)
+            self.user_cache[email] = data
+        return UserAuth(**data)
+
+    async def clear_user_cache(self, email: str):
+        """
+        Drop cached data for a user from the in-process cache and Redis.
+
+        :param email: The user's email.
+        :type email: str
+        :return: None
+        :rtype: None
+        """
+        self.user_cache.pop(email, None)
+        await self.r.delete(f"user:{email}")
 
 
 auth_service = Auth()
\ No newline at end of file
@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import MagicMock
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
 from database.models import User,UserAuth
 from schemas import  UserSchema, UserModel
@@ -18,41 +18,41 @@ from repository.users import (
     update_user,
     remove_user,
     confirmed_email,
+    _birthday_window,
 )
 
 class TestUsers(unittest.IsolatedAsyncioTestCase):
 
     def setUp(self):
-        self.session = MagicMock(spec=Session)
+        self.session = MagicMock(spec=AsyncSession)
+        self.result = MagicMock()
+        self.session.execute.return_value = self.result
         self.user = User(id=1)
 
     async def test_get_user_by_email(self):
         user_auth = UserAuth(email="test@example.com")
-        self.session.query().filter().first.return_value = user_auth
+        self.result.scalar_one_or_none.return_value = user_auth
         result = await get_user_by_email(email="test@example.com", db=self.session)
         self.assertEqual(result, user_auth)
 
     async def test_get_user_by_email_not_found(self):
-        self.session.query().filter().first.return_value = None
+        self.result.scalar_one_or_none.return_value = None
         result = await get_user_by_email(email="nonexistent@example.com", db=self.session)
         self.assertIsNone(result)
 
     async def test_create_user(self):
         user_data = UserModel(email="new@example.com")
         new_user = UserAuth(**user_data.dict(), avatar=None)
-        self.session.add.return_value = None
-        self.session.commit.return_value = None
-        self.session.refresh.return_value = None
         result = await create_user(body=user_data, db=self.session)
         self.assertEqual(result, new_user)
 
     async def test_update_avatar(self):
-        user_auth = UserAuth(email="test@example.com", avatar="old_url")
-        self.session.query().filter().first.return_value = user_auth
-        new_url = "new_url"
-        result = await update_avatar(email="test@example.com", url=new_url, db=self.session)
+        user_auth = UserAuth(email="test@example.com", avatar="new_url")
+        self.result.scalar_one.return_value = user_auth
+        result = await update_avatar(email="test@example.com", url="new_url", db=self.session)
         self.assertEqual(result, user_auth)
-        self.assertEqual(result.avatar, new_url)
+        self.assertEqual(result.avatar, "new_url")
+        self.session.commit.assert_called_once()
     
     async def test_update_token(self):
         user_auth = UserAuth(email="test@example.com")
@@ -64,19 +64,19 @@ class TestUsers(unittest.IsolatedAsyncioTestCase):
 
     async def test_get_users(self):
         users = [User(), User(), User()]
-        self.session.query().filter().offset().limit().all.return_value = users
+        self.result.mappings().all.return_value = users
         result = await get_users(skip=0, limit=10, user=self.user, db=self.session)
         self.assertEqual(result, users)
 
 
     async def test_get_user_found(self):
         user = User()
-        self.session.query().filter().first.return_value = user
+        self.result.scalar_one_or_none.return_value = user
         result = await get_user(user_id=1, user=self.user, db=self.session)
         self.assertEqual(result, user)
 
     async def test_get_user_not_found(self):
-        self.session.query().filter().first.return_value = None
+        self.result.scalar_one_or_none.return_value = None
         result = await get_user(user_id=1, user=self.user, db=self.session)
         self.assertIsNone(result)
 
@@ -91,32 +91,48 @@ class TestUsers(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result.other_description, body.other_description)
 
     async def test_get_birthday(self):
-        users = [User(birthday_date="2023-10-26")]
+        users = [User(birthday_date=date(2023, 10, 26))]
         today = date(2023, 10, 26)
-        end_date = date(2023, 10, 27)
-        self.session.query().all.return_value = users
-        result = await get_birthday(today, end_date, user=self.user, db=self.session)
+        self.result.mappings().all.return_value = users
+        result = await get_birthday(today, 7, user=self.user, db=self.session)
         self.assertEqual(result, users)
 
+    def test_birthday_window_wraps_year(self):
+        result = _birthday_window(date(2026, 12, 28), 7)
+        self.assertEqual(result, [(12, 28), (12, 29), (12, 30), (12, 31), (1, 1), (1, 2), (1, 3), (1, 4)])
+
+    def test_birthday_window_feb_29_in_non_leap_year(self):
+        result = _birthday_window(date(2027, 2, 26), 7)
+        self.assertEqual(result, [(2, 26), (2, 27), (2, 28), (2, 29), (3, 1), (3, 2), (3, 3), (3, 4), (3, 5)])
+
+    def test_birthday_window_leap_year(self):
+        result = _birthday_window(date(2028, 2, 26), 7)
+        self.assertEqual(result, [(2, 26), (2, 27), (2, 28), (2, 29), (3, 1), (3, 2), (3, 3), (3, 4)])
+
     async def test_search_users(self):
-        users = [User(first_name="John"), User(last_name="Doe"), User(email="johndoe@example.com")]
-        self.session.query().all.return_value = users
+        users = [User(first_name="John")]
+        self.result.mappings().all.return_value = users
         result = await search_users(first_name="John", last_name=None, email=None, user=self.user, db=self.session)
         self.assertEqual(result, users)
 
+    async def test_search_users_no_criteria(self):
+        result = await search_users(first_name=None, last_name=None, email=None, user=self.user, db=self.session)
+        self.assertEqual(result, [])
+
     async def test_remove_user_found(self):
         user = User()
-        self.session.query().filter().first.return_value = user
+        self.result.scalar_one_or_none.return_value = user
         result = await remove_user(user_id=1, user=self.user, db=self.session)
         self.assertEqual(result, user)
 
     async def test_remove_user_not_found(self):
-        self.session.query().filter().first.return_value = None
+        self.result.scalar_one_or_none.return_value = None
         result = await remove_user(user_id=1, user=self.user, db=self.session)
         self.assertIsNone(result)
 
     async def test_update_user_found(self):
         body = UserSchema(first_name="test",last_name="test",birthday_date="2000-01-01",phone_numbers="0000000000",email="test@mail.com",other_description="test")
+        self.result.scalar_one_or_none.return_value = User(id=1, **body.dict())
         result = await update_user(user_id=1, body=body, user=self.user, db=self.session)
         self.assertEqual(result.first_name, body.first_name)
         self.assertEqual(result.last_name, body.last_name)
@@ -127,17 +143,14 @@ class TestUsers(unittest.IsolatedAsyncioTestCase):
 
     async def test_update_user_not_found(self):
         body = UserSchema(first_name="test",last_name="test",birthday_date="2000-01-01",phone_numbers="0000000000",email="test@mail.com",other_description="test")
-        self.session.query().filter().first.return_value = None
-        self.session.commit.return_value = None
+        self.result.scalar_one_or_none.return_value = None
         result = await update_user(user_id=1, body=body, user=self.user, db=self.session)
         self.assertIsNone(result)
 
     async def test_confirmed_email(self):
-        user_auth = UserAuth(email="test@example.com", confirmed=False)
-        self.session.query().filter().first.return_value = user_auth
-        self.session.commit.return_value = None
         result = await confirmed_email(email="test@example.com", db=self.session)
-        self.assertTrue(user_auth.confirmed)
+        self.session.execute.assert_called_once()
+        self.session.commit.assert_called_once()
         self.assertIsNone(result)
 
 
@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import UserAuth
+from services.auth import Auth, auth_service
+
+
+class TestAuthUserCache(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.email = "test@example.com"
+        self.data = {"id": 1, "email": self.email, "username": "tester", "confirmed": True, "avatar": None}
+        self.session = MagicMock(spec=AsyncSession)
+        self.redis = AsyncMock()
+        self.redis.get.return_value = None
+        self.original_redis = Auth.r
+        Auth.r = self.redis
+        Auth.user_cache.clear()
+        self.token = await auth_service.create_access_token(data={"sub": self.email})
+
+    def tearDown(self):
+        Auth.r = self.original_redis
+        Auth.user_cache.clear()
+
+    async def test_ttl_cache_hit_skips_redis(self):
+        Auth.user_cache[self.email] = self.data
+        result = await auth_service.get_current_user(token=self.token, db=self.session)
+        self.assertEqual(result.email, self.email)
+        self.assertEqual(result.username, "tester")
+        self.redis.get.assert_not_awaited()
+
+    async def test_redis_hit_fills_ttl_cache(self):
+        self.redis.get.return_value = orjson.dumps(self.data)
+        with patch("services.auth.repository_users.get_user_by_email", new=AsyncMock()) as get_user_by_email:
+            result = await auth_service.get_current_user(token=self.token, db=self.session)
+        self.assertEqual(result.id, 1)
+        self.assertEqual(Auth.user_cache[self.email], self.data)
+        self.redis.get.assert_awaited_once_with(f"user:{self.email}")
+        get_user_by_email.assert_not_awaited()
+
+    async def test_cache_miss_writes_redis_with_ttl(self):
+        user = UserAuth(password="hashed", refresh_token="refresh", **self.data)
+        with patch("services.auth.repository_users.get_user_by_email", new=AsyncMock(return_value=user)):
+            result = await auth_service.get_current_user(token=self.token, db=self.session)
+        self.assertEqual(result.email, self.email)
+        self.redis.set.assert_awaited_once_with(f"user:{self.email}", orjson.dumps(self.data), ex=900)
+        self.assertEqual(Auth.user_cache[self.email], self.data)
+
+    async def test_clear_user_cache(self):
+        Auth.user_cache[self.email] = self.data
+        await auth_service.clear_user_cache(self.email)
+        self.assertNotIn(self.email, Auth.user_cache)
+        self.redis.delete.assert_awaited_once_with(f"user:{self.email}")
+
+
+if __name__ == '__main__':
+    unittest.main()